@@ -0,0 +1,234 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import multiprocessing as mp
+import numpy as np
+import argparse
+import time
+import sys
+import os
+
+# Figure and shared trajectory of the worker process, set up by
+# init_worker() for the export the last frame belonged to
+worker = {}
+
+def create_pool(processes=None):
+    '''Returns a pool of 'processes' worker processes (all cores if None),
+       which can be shared by several AnimationExports.'''
+    return ProcessPoolExecutor(processes,mp_context=mp.get_context('spawn'))
+
+def init_worker(name,shape,limits,size,dpi,color):
+    '''Sets up the worker process for an export: attaches to the shared
+       trajectory 'name' of 'shape' and creates a figure of 'size' pixels,
+       which is reused for every frame of the export. The trajectory of the
+       previous export is released.'''
+    # Matplotlib is used without pyplot, so no GUI backend is involved
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from mpl_toolkits import mplot3d
+
+    if worker:
+        shm = worker['shm']
+        worker.clear()
+        # The old figure may still reference the block, it is closed anyway
+        # when the process ends
+        try:
+            shm.close()
+        except BufferError:
+            pass
+
+    shm = shared_memory.SharedMemory(name=name)
+    data = np.ndarray(shape,dtype=np.float64,buffer=shm.buf)
+
+    fig = Figure(figsize=(size[0]/dpi,size[1]/dpi),dpi=dpi,facecolor='black')
+    FigureCanvasAgg(fig)
+    ax = fig.add_axes((0,0,1,1),projection='3d',facecolor='black')
+    ax.set_axis_off()
+    ax.set_xlim(*limits[0])
+    ax.set_ylim(*limits[1])
+    ax.set_zlim(*limits[2])
+    line, = ax.plot(data[:1,0],data[:1,1],data[:1,2],color=color,linewidth=1)
+
+    worker.update(name=name,shm=shm,data=data,fig=fig,ax=ax,line=line)
+
+def render_frame(setup,end,azimuth,elevation,path):
+    '''Renders the first 'end' values of the shared trajectory seen from
+       'azimuth' and 'elevation' and writes the frame to 'path' (.png). The
+       worker is set up with init_worker(*setup) first if the frame belongs to
+       another export than the previous one.'''
+    if worker.get('name') != setup[0]:
+        init_worker(*setup)
+    data = worker['data'][:end]
+    worker['line'].set_data_3d(data[:,0],data[:,1],data[:,2])
+    worker['ax'].view_init(elev=elevation,azim=azimuth)
+    worker['fig'].savefig(path,facecolor='black')
+    return path
+
+class AnimationExport():
+    '''ANIMATIONEXPORT(data,directory,frames=300,size=(1920,1080),
+       azimuth=(30,390),elevation=(30,30),evolve=False,processes=None,
+       prefix='frame',pool=None) renders an animation of the trajectory
+       'data' (n x 3) as a numbered sequence of .png-files in 'directory'
+       named after 'prefix'. The camera moves linearly from the first to the
+       second value of 'azimuth' and 'elevation'. If 'evolve' is True, the
+       trajectory is drawn progressively. Frames are rendered by a pool of
+       'processes' worker processes (all cores if None) and only a few frames
+       per process are queued at a time, so the memory needed does not depend
+       on the number of frames. If 'pool' (see create_pool()) is given, it is
+       used instead of starting a new one and it is not shut down by the
+       export.'''
+    color = (245/255,187/255,32/255)
+    dpi = 100
+
+    def __init__(self,data,directory,frames=300,size=(1920,1080),\
+                 azimuth=(30,390),elevation=(30,30),evolve=False,\
+                 processes=None,prefix='frame',pool=None):
+        self.data = np.asarray(data,dtype=np.float64)[:,:3]
+        self.directory = directory
+        self.frames = frames
+        self.size = size
+        self.azimuth = np.linspace(azimuth[0],azimuth[1],frames)
+        self.elevation = np.linspace(elevation[0],elevation[1],frames)
+        self.evolve = evolve
+        self.processes = processes or os.cpu_count()
+        self.prefix = prefix
+
+        self.pool = pool
+        self.ownPool = pool is None
+        self.setup = None
+        self.shm = None
+        self.pending = set()
+        self.nextFrame = 0
+        self.finished = 0
+
+    def frame_path(self,ind):
+        '''Returns the file name of frame 'ind'.'''
+        digits = max(4,len(str(self.frames - 1)))
+        return os.path.join(self.directory,'%s_%0*d.png' \
+                            %(self.prefix,digits,ind))
+
+    def start(self):
+        '''Copies the trajectory to shared memory, starts the worker processes
+           (unless a pool was given) and queues the first frames.'''
+        os.makedirs(self.directory,exist_ok=True)
+        self.shm = shared_memory.SharedMemory(create=True,size=self.data.nbytes)
+        shared = np.ndarray(self.data.shape,dtype=np.float64,buffer=self.shm.buf)
+        shared[:] = self.data
+
+        # Axes limits are fixed, so the camera path is the only movement
+        limits = [(lo,hi) if hi > lo else (lo - 1,hi + 1) for lo,hi in \
+                  zip(self.data.min(0),self.data.max(0))]
+        self.setup = (self.shm.name,self.data.shape,limits,self.size,\
+                      self.dpi,self.color)
+        if self.pool is None:
+            self.pool = create_pool(self.processes)
+        self.queue_frames()
+
+    def queue_frames(self):
+        '''Queues frames until every process has two frames to work on.'''
+        n = len(self.data)
+        while self.nextFrame < self.frames and \
+              len(self.pending) < 2*self.processes:
+            k = self.nextFrame
+            end = max(2,int(np.ceil(n*(k + 1)/self.frames))) if self.evolve \
+                  else n
+            self.pending.add(self.pool.submit(render_frame,self.setup,end,\
+                                              self.azimuth[k],\
+                                              self.elevation[k],\
+                                              self.frame_path(k)))
+            self.nextFrame += 1
+
+    def poll(self):
+        '''Collects finished frames and queues new ones. Returns the number of
+           frames finished so far. Errors of the workers are raised here.'''
+        for future in [f for f in self.pending if f.done()]:
+            self.pending.remove(future)
+            future.result()
+            self.finished += 1
+        if self.finished == self.frames:
+            self.stop()
+        else:
+            self.queue_frames()
+        return self.finished
+
+    def done(self):
+        '''Returns True once all frames are written.'''
+        return self.finished == self.frames
+
+    def stop(self):
+        '''Stops the worker processes (unless the pool was given) and frees the
+           shared memory. Frames not written yet are dropped.'''
+        for future in self.pending:
+            future.cancel()
+        if self.pool is not None and self.ownPool:
+            self.pool.shutdown(wait=True,cancel_futures=True)
+            self.pool = None
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+        self.pending = set()
+
+    def run(self,stream=sys.stdout,interval=0.1):
+        '''Renders all frames, printing the progress to 'stream'. Returns the
+           time needed.'''
+        start = time.perf_counter()
+        self.start()
+        try:
+            while not self.done():
+                time.sleep(interval)
+                print('\r%d/%d frames' %(self.poll(),self.frames),end='',\
+                      file=stream)
+                stream.flush()
+        finally:
+            self.stop()
+        runtime = time.perf_counter() - start
+        print('\nWrote %d frames in %.2f s (%.1f frames/s) to %s' \
+              %(self.frames,runtime,self.frames/runtime,self.directory),\
+              file=stream)
+        return runtime
+
+def load_trajectory(file):
+    '''Reads a trajectory from a .npy or .csv file as written by batch.py
+       (columns t,x,y,z,locErr) or from a .npy file with the columns x,y,z.'''
+    if file.endswith('.csv'):
+        data = np.loadtxt(file,delimiter=',',skiprows=1,ndmin=2)
+    else:
+        data = np.load(file,mmap_mode='r')
+    return data[:,1:4] if data.shape[1] == 5 else data[:,:3]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Render an animation of a '+\
+                                     'trajectory as numbered .png-files.')
+    parser.add_argument('trajectory',help='.npy or .csv file, e.g. written '+\
+                        'by batch.py')
+    parser.add_argument('directory',help='output directory')
+    parser.add_argument('-n','--frames',type=int,default=300,\
+                        help='number of frames')
+    parser.add_argument('-s','--size',default='1920x1080',\
+                        help='resolution as WIDTHxHEIGHT')
+    parser.add_argument('--azimuth',type=float,nargs=2,default=(30,390),\
+                        help='azimuth of the first and last frame')
+    parser.add_argument('--elevation',type=float,nargs=2,default=(30,30),\
+                        help='elevation of the first and last frame')
+    parser.add_argument('--evolve',action='store_true',\
+                        help='draw the trajectory progressively')
+    parser.add_argument('-j','--processes',type=int,default=None,\
+                        help='number of worker processes (default: all cores)')
+    args = parser.parse_args(argv)
+
+    try:
+        size = tuple(int(v) for v in args.size.lower().split('x'))
+        if len(size) != 2:
+            raise ValueError
+    except ValueError:
+        parser.error('invalid resolution %r' %args.size)
+
+    export = AnimationExport(load_trajectory(args.trajectory),args.directory,\
+                             frames=args.frames,size=size,\
+                             azimuth=args.azimuth,elevation=args.elevation,\
+                             evolve=args.evolve,processes=args.processes)
+    export.run()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
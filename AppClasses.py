@@ -0,0 +1,705 @@
+import WidgetClasses as wc
+from Solvers import solverDic, attractorDic
+import Workers as wk
+import Reference as rf
+import Animation as an
+import PyQt5.QtWidgets as qt
+from PyQt5.QtCore import QTimer
+from vispy import app
+import numpy as np
+import time
+import sys
+
+class Attractor(qt.QWidget):
+    '''Attractor(parent=None,type={'Lorenz','Thomas'},solver={'Runge Kutta 4',
+                 'Explicit Euler'},process=False,burnIn=True)
+       creates an Attractor object and embeds it into a surrunding GUI if PARENT
+       is a valid QGridLayout. If PROCESS is True, the ODE is solved by a
+       Worker in a separate process and the plot only renders its results. If
+       BURNIN is True, the standard initial values are replaced by a state on
+       the attractor once it is found in the background, so the transient is
+       not plotted.
+    '''
+    # Interval for polling the Worker's results (in seconds)
+    frameInterval = 1/60
+    # Time the reference's inputs must stay unchanged before it is requested
+    # (in seconds), so dragging a slider does not start a computation per step
+    refDelay = 0.5
+
+    def __init__(self,parent = None,type = 'Lorenz', solver = 'Runge Kutta 4',\
+                 process = False, burnIn = True):
+        super().__init__()
+
+        self.parent = parent
+        self.process = process
+        self.burnIn = burnIn
+        self.type = type
+        self.solvName = solver
+        self.ODE = attractorDic[type]['ODE']
+        self.solver = solverDic[solver]
+
+        self.initUI()
+        self.config()
+
+    def initUI(self):
+        '''Create Widget Layout'''
+        layout = qt.QVBoxLayout()
+
+        # Creating Widget elements for settings and the sliders and adding it to
+        # Attractor's layout. The plot is created once the event loop runs, a
+        # placeholder keeps its position in the layout until then
+        self.plot = None
+        self.placeholder = qt.QWidget()
+        self.sliders = wc.sliders(nams=attractorDic[self.type]['Parameters'][0],\
+                                  vals=attractorDic[self.type]['Parameters'][1],\
+                                  ints=attractorDic[self.type]['Interval'])
+        self.settings = wc.settings(attractorDic.keys(), self.type,\
+                                    solverDic.keys(), self.solvName,\
+                                    self.startValues())
+        layout.addWidget(self.placeholder)
+        layout.addWidget(self.settings)
+        layout.addWidget(self.sliders)
+        self.setLayout(layout)
+        QTimer.singleShot(0,self.initPlot)
+
+        # If the widget is embedded in a AttractorApp, Attractor is added to the
+        # AttractorApp's layout
+        if self.parent != None:
+            self.parent.addWidget(self)
+
+    def initPlot(self):
+        '''Creates the vispy canvas and replaces the placeholder with it.
+           Called from the event loop, so the window can be shown before the
+           canvases are created, or directly if the plot is needed earlier.'''
+        if self.plot is not None:
+            return
+        self.plot = wc.plot(np.array([self.standardVals]))
+        self.layout().replaceWidget(self.placeholder,self.plot.native)
+        self.placeholder.deleteLater()
+
+    def config(self):
+        '''Configure Widget Elements'''
+
+        # Initializing Variables for keeping track of the timestep, runtime,
+        # calculation time (to be averaged), error estimates (to be averaged)
+        self.timestep = []
+        self.timeElapsed = 0
+        self.prevTimeVals = []
+        self.prevLocErr = []
+
+        # Initial values the running curve started from
+        self.runStart = self.standardVals
+
+        # Variables for comparing with the reference trajectory, which starts
+        # at time refOrigin
+        self.refKey = None
+        self.refODE = None
+        self.refOrigin = 0
+        self.refTime = 0
+        self.refAnchor = None
+        self.divergence = None
+
+        # Cross-connecting signals of GUI elements from plot, settings, sliders
+        self.settings.AttrDropdown.currentIndexChanged.connect(self.updateAttractor)
+        self.settings.SolvDropdown.currentIndexChanged.connect(self.updateSolver)
+        self.settings.PauseButton.clicked.connect(self.pause)
+        self.settings.RestartButton.clicked.connect(self.restart)
+        self.sliders.Signal.changed.connect(self.updateParameters)
+
+        # ODE parameters in use, set by updateParameters()
+        self.odeParams = None
+
+        # Starting the Worker process which solves the ODE if required
+        self.worker = None
+        if self.process:
+            self.worker = wk.Worker(self.type,self.solvName,\
+                                    self.sliders.param_values(),\
+                                    self.sliders.timestep_value(),\
+                                    self.standardVals)
+
+        # Setting up a timer to call draw-method repeatedly
+        self.timer = app.Timer(interval = self.sliders.timestep_value(),\
+                               connect = self.draw, start = True)
+
+        self.updateParameters()
+
+    def updateParameters(self):
+        '''Called when any slider is moved.
+           Requests values from sliders() and updates the timer as well as
+           the ODE parameters accordingly'''
+        self.timestep = self.sliders.timestep_value()
+        params = self.sliders.param_values()
+
+        # The reference does not depend on the timestep, so it is only
+        # anchored anew if the parameters changed
+        if params != self.odeParams:
+            self.odeParams = params
+            self.updateODE()
+            self.anchorReference()
+        self.updateTimer()
+
+    def updateODE(self):
+        '''Updates the ODE to be solved according to the current slider values'''
+        self.ode2solve = self.ODE(self.sliders.param_values())
+        if self.worker is not None:
+            self.changeTag = self.worker.set_parameters(self.sliders.param_values())
+
+    def updateAttractor(self):
+        '''Called when a new Attractor is selected from the dropdown menu.
+           Pauses the current plots, removes the sliders and adds the ones
+           corresponding to the current Attractor again, updates ODE to solve.'''
+        self.settings.PauseButton.toggle()
+        self.pause()
+
+        self.type = self.settings.AttrDropdown.currentText()
+        self.ODE = attractorDic[self.type]['ODE']
+
+        self.sliders.deleteLater()
+        self.sliders = wc.sliders(nams=attractorDic[self.type]['Parameters'][0],\
+                                  vals=attractorDic[self.type]['Parameters'][1],\
+                                  ints=attractorDic[self.type]['Interval'])
+        self.sliders.Signal.changed.connect(self.updateParameters)
+        self.layout().addWidget(self.sliders)
+        self.settings.set_initVals(self.startValues())
+
+        if self.worker is not None:
+            self.worker.set_attractor(self.type,self.sliders.param_values())
+        self.odeParams = self.sliders.param_values()
+        self.updateODE()
+        self.anchorReference()
+
+    def updateSolver(self):
+        '''Called when a new Solver is selected from the dropdown menu.
+           Updates the solver function accordingly. The reference does not
+           depend on the solver, so the current comparison is kept and a
+           restart reuses the cached reference for the initial values.'''
+        self.solvName = self.settings.SolvDropdown.currentText()
+        self.solver = solverDic[self.solvName]
+        if self.worker is not None:
+            self.worker.set_solver(self.solvName)
+
+    def currentState(self):
+        '''Returns the last solved value, or the initial value if the plot is
+           not created yet.'''
+        if self.plot is None:
+            return self.standardVals
+        return self.plot.CurveData[-1]
+
+    def startValues(self):
+        '''Returns the standard initial values for the current attractor and
+           parameters and keeps them as 'standardVals'. If burnIn is enabled,
+           these are an (cached) on-attractor state instead of the ones from
+           the attractorDic. If the burn-in is not done yet, the values from
+           the attractorDic are returned and checkBurnIn() swaps the state in
+           later.'''
+        vals = attractorDic[self.type]['InVal']
+        self.burnInParams = None
+        if self.burnIn:
+            params = self.sliders.param_values()
+            done,state = wk.burnInEngine.get(self.type,params)
+            if not done:
+                self.burnInParams = list(params)
+            elif state is not None:
+                # Rounded, so the values match the ones shown in the text edits
+                vals = [float('%.6g' %v) for v in state]
+        self.standardVals = vals
+        return vals
+
+    def checkBurnIn(self):
+        '''Called by draw(). Once the burn-in requested by startValues() is
+           done, its state becomes the standard initial values, unless the
+           text edits were changed in the meantime. If the running curve
+           started from the values it replaces, the curve is restarted on the
+           attractor. If the parameters were changed in the meantime, the
+           burn-in for the current ones is requested instead.'''
+        if self.burnInParams is None:
+            return
+        params = self.sliders.param_values()
+        if self.burnInParams != params:
+            self.burnInParams = list(params)
+        done,state = wk.burnInEngine.get(self.type,self.burnInParams)
+        if not done:
+            return
+        self.burnInParams = None
+        if state is None:
+            return
+
+        try:
+            untouched = self.settings.get_initVals() == self.standardVals
+        except ValueError:
+            untouched = False
+        if not untouched:
+            return
+
+        replaced = self.standardVals
+        self.standardVals = [float('%.6g' %v) for v in state]
+        self.settings.set_initVals(self.standardVals)
+        if self.runStart == replaced and \
+           not self.settings.PauseButton.isChecked():
+            self.startFrom(self.standardVals)
+
+    def startFrom(self,vals):
+        '''Resets the plot and the time and starts solving from 'vals'.'''
+        self.plot.reset_data(np.array([vals]))
+        if self.worker is not None:
+            self.worker.restart(vals)
+        self.updateReference(vals,0)
+        self.runStart = vals
+        self.timeElapsed = 0
+        self.prevTimeVals = []
+        self.prevLocErr = []
+
+    def anchorReference(self):
+        '''Called after the attractor or its parameters changed. Starts a new
+           comparison from the current state. A Worker applies the change
+           later, so the comparison starts once it reported where it did.'''
+        self.updateReference(self.currentState(),self.timeElapsed)
+        if self.worker is not None:
+            self.refAnchor = self.changeTag
+
+    def updateReference(self,y0,origin):
+        '''Starts comparing against a reference trajectory starting at 'y0' at
+           time 'origin', using the current attractor and parameters. The
+           reference is requested from the engine once the inputs did not
+           change for 'refDelay' seconds and computed in the background unless
+           it is cached. The previous reference is released, so every
+           Attractor waits for one reference at most.'''
+        params = self.sliders.param_values()
+        key = rf.engine.key(self.type,params,y0)
+        if self.refKey != key:
+            if self.refKey is not None:
+                rf.engine.release(self.refKey)
+            rf.engine.request(key)
+
+        self.refKey = key
+        self.refODE = self.ODE(params)
+        self.refOrigin = origin
+        self.refTime = time.perf_counter()
+        self.refAnchor = None
+        self.divergence = None
+
+    def updateGlobalError(self):
+        '''Compares the last solved value with the reference trajectory and
+           hands the global error and the time of divergence to the plot.'''
+        # Waiting for the Worker to report where the last change took effect
+        if self.refAnchor is not None:
+            anchor = self.worker.anchor(self.refAnchor)
+            if anchor is None:
+                self.plot.update_global_error(None,status='computing reference ...')
+                return
+            self.updateReference(anchor[1:],anchor[0])
+
+        states = None
+        if time.perf_counter() - self.refTime >= self.refDelay:
+            states = rf.engine.get(self.refKey)
+        if states is None:
+            self.plot.update_global_error(None,status='computing reference ...')
+            return
+
+        # The reference ends where it stops being accurate, errors past that
+        # point would be the reference's own
+        tau = self.timeElapsed - self.refOrigin
+        yRef = rf.interpolate(states,self.refODE,rf.engine.step,tau)
+        if yRef is None:
+            self.plot.update_global_error(None,status='beyond reference')
+            return
+
+        err = np.linalg.norm(self.plot.CurveData[-1] - yRef)/np.linalg.norm(yRef)
+        if self.divergence is None and err > rf.divergenceTol:
+            self.divergence = tau
+        self.plot.update_global_error(err,self.divergence)
+
+    def updateTimer(self):
+        '''Called when any slider is moved. Updates the timer's interval. If a
+           Worker solves the ODE, the timer only polls for its results.'''
+        if self.worker is not None:
+            self.worker.set_timestep(self.sliders.timestep_value())
+            self.timer.interval = self.frameInterval
+        else:
+            self.timer.interval = self.sliders.timestep_value()
+
+    def draw(self,events):
+        '''Solve the ODE for the next timestep and visualize it.'''
+        # Swapping in burn-in states, also while paused
+        if self.plot is not None:
+            self.checkBurnIn()
+
+        # If plot is not paused and already created
+        if self.plot is not None and not self.settings.PauseButton.isChecked():
+            if self.worker is not None:
+                # Collect all steps the Worker solved since the last call
+                rows = self.worker.read()
+                if not len(rows):
+                    return
+                self.timeElapsed = rows[-1,0]
+                self.plot.add_data(rows[:,1:4])
+                self.prevTimeVals.extend(rows[:,4])
+                self.prevLocErr.extend(rows[:,5])
+            else:
+                # Solve ODE with previous timestep and current timestep value
+                y = self.plot.CurveData[-1]
+                delta_t = self.timestep
+                yn,t,err = self.solver(y,self.ode2solve,delta_t)
+
+                # Update the plot by adding the data to it and increasing the
+                # time
+                self.timeElapsed += delta_t
+                self.plot.add_data([yn])
+                self.prevTimeVals.append(t)
+                self.prevLocErr.append(err)
+            self.plot.update_runtime(self.timeElapsed)
+
+            # Averaging the values for speed and error and displaying it by
+            # handing it to the plot
+            if len(self.prevTimeVals) > 20:
+                self.plot.update_speed(np.average(self.prevTimeVals))
+                self.plot.update_error(np.average(self.prevLocErr))
+                self.updateGlobalError()
+                self.prevTimeVals = []
+                self.prevLocErr = []
+
+    def pause(self):
+        '''Called when the PauseButton is clicked. Pauses Plotting.'''
+        if self.worker is not None:
+            self.worker.pause(self.settings.PauseButton.isChecked())
+        if self.settings.PauseButton.isChecked():
+            self.settings.PauseButton.setText(chr(9654))
+            print('Paused ...')
+        else:
+            self.settings.PauseButton.setText('||')
+            print('Continued ...')
+
+    def restart(self):
+        '''Called when the RestartButton is clicked. Restarts Plotting.'''
+        self.initPlot()
+
+        # Try to set initial values from the values entered. If the strings
+        # can't be converted to numbers an error is handled
+        try:
+            newInitVals = self.settings.get_initVals()
+        except:
+            # Plot data is reset but the standard initial value is taken,
+            # these values are also filled into the text edits
+            vals = self.startValues()
+            self.settings.set_initVals(vals)
+            self.startFrom(vals)
+            print('Invalid Initial Values. Using standard Values instead.')
+            # Let a possible overlying function know that an Exception was raised
+            return -1
+        else:
+            # Standard values that were not edited are replaced by the ones
+            # for the current parameters
+            if newInitVals in (attractorDic[self.type]['InVal'],\
+                               self.standardVals):
+                newInitVals = self.startValues()
+                self.settings.set_initVals(newInitVals)
+
+            # Reset the plot and set entered values as initial values
+            self.startFrom(newInitVals)
+            print('Restarted...')
+            # Let a possible overlying function know that no Exception was raised
+            return 0
+        finally:
+            # Resume plotting if paused
+            if self.settings.PauseButton.isChecked():
+                self.settings.PauseButton.toggle()
+                self.pause()
+
+    def shutdown(self):
+        '''Stops the timer and the Worker process, if there is one, and
+           releases the reference.'''
+        self.timer.stop()
+        if self.refKey is not None:
+            rf.engine.release(self.refKey)
+            self.refKey = None
+        if self.worker is not None:
+            self.worker.stop()
+            self.worker = None
+
+    def closeEvent(self,event):
+        '''Called when a stand-alone Attractor's window is closed.'''
+        self.shutdown()
+        super().closeEvent(event)
+
+class AttractorApp(qt.QMainWindow):
+    '''AttractorApp(n = 2,types = list({'Lorenz','Thomas'})) creates a
+       PyQt5-Application which features N Attractor-Objects aligned
+       horizontally. The attractors' types can be set using the TYPES kwarg, but
+       its length must match N. If PROCESSES is True, every Attractor solves
+       its ODE in a separate process. BURNIN is handed to every Attractor.
+    '''
+    # Camera paths offered for the animation export
+    cameraPaths = {'Rotate' : {'azimuth' : (30,390), 'evolve' : False},
+                   'Evolve' : {'azimuth' : (30,30), 'evolve' : True},
+                   'Evolve and rotate' : {'azimuth' : (30,390), 'evolve' : True}}
+
+    def __init__(self,n = 2,types = ['Lorenz'],processes = False,\
+                 burnIn = True):
+        super().__init__()
+
+        self.nOfPlots = n
+        self.processes = processes
+        self.burnIn = burnIn
+        self.attractors = []
+        self.types = types
+        if n > 1:
+            self.types *= n
+
+        self.initUI(n)
+        self.config()
+
+    def initUI(self,n):
+        # Creating GUI Main Window
+        self.setWindowTitle('AttractorApp')
+        win = qt.QWidget()
+
+        # Creating Layouts
+        mainLayout = qt.QVBoxLayout()
+        plotsLayout = qt.QHBoxLayout()
+        buttonLayout = qt.QHBoxLayout()
+
+        # Creating Widgets
+        plots = qt.QGroupBox()
+        buttons = qt.QGroupBox()
+
+        # Creating Buttons
+        self.restartButton = qt.QPushButton('Restart all')
+        self.pauseButton = qt.QPushButton('Pause all')
+
+        # Creating the right amount of Attractor()-Objects
+        for k in range(self.nOfPlots):
+            self.attractors.append(Attractor(parent = plotsLayout,\
+                                             type = self.types[k],\
+                                             process = self.processes,\
+                                             burnIn = self.burnIn))
+
+        # Attractos got added to the plotLayout within the constructor of
+        # Attractor(), therefore the layout can already be added to the GroupBox
+        plots.setLayout(plotsLayout)
+
+        # Adding remaining Widgets to Layouts
+        buttonLayout.addWidget(self.pauseButton)
+        buttonLayout.addWidget(self.restartButton)
+        buttons.setLayout(buttonLayout)
+
+        mainLayout.addWidget(plots)
+        mainLayout.addWidget(buttons)
+
+        win.setLayout(mainLayout)
+        self.setCentralWidget(win)
+
+        # Create statusBar and menuBar
+        self.Status = self.statusBar()
+        self.makeMenuBar()
+
+        self.show()
+
+    def config(self):
+        # Connecting and setting up Buttons
+        self.pauseButton.setCheckable(True)
+        self.restartButton.clicked.connect(self.restartAll)
+        self.pauseButton.clicked.connect(self.pauseAll)
+
+        # Animation exports run one after another, a timer polls their progress
+        self.animations = []
+        self.animPool = None
+        self.animTimer = QTimer()
+        self.animTimer.timeout.connect(self.pollAnimations)
+
+        # Redirecting stout to the status bar
+        sys.stdout = wc.Status(self.Status)
+
+    def restartAll(self):
+        '''Restart all Attractors contained in the AttractorApp.'''
+        # Performing a 'checksum' for possibly invalid inputs for initial values
+        ret = 0
+        for a in self.attractors:
+            ret += a.restart()
+
+        if self.pauseButton.isChecked():
+            self.pauseButton.toggle()
+            self.pauseAll()
+        print('Restarted all...' if not ret else 'Restarted all... (one or '+\
+               'more input Initial Values where invalid. The standard Values '+\
+               'where used for those.)')
+
+    def pauseAll(self):
+        '''Pause/Restart all Attractors contained in the AttractorApp'''
+        for a in self.attractors:
+            if self.pauseButton.isChecked() != a.settings.PauseButton.isChecked():
+                a.settings.PauseButton.toggle()
+                a.pause()
+
+        if self.pauseButton.isChecked():
+            print('Paused all ...')
+            self.pauseButton.setText('Continue all')
+        else:
+            print('Continued all ...')
+            self.pauseButton.setText('Pause all')
+
+    def closeEvent(self,event):
+        '''Called when the AttractorApp is closed. Stops all Attractors.'''
+        for a in self.attractors:
+            a.shutdown()
+        rf.engine.shutdown()
+        wk.burnInEngine.shutdown()
+        self.stopAnimations()
+        super().closeEvent(event)
+
+    def makeMenuBar(self):
+        # Creating menuBar and menus
+        menuBar = self.menuBar()
+        fileMenu = menuBar.addMenu('File')
+        aboutMenu = menuBar.addMenu('About')
+
+        # Creating Actions
+        newAction = qt.QAction('New',self)
+        saveVAction = qt.QAction('Vispy',self)
+        saveMAction = qt.QAction('Matplotlib',self)
+        saveAAction = qt.QAction('Animation',self)
+        infoAction = qt.QAction('Information',self)
+        aboutAction = qt.QAction('About',self)
+
+        # Creating Shortcuts
+        newAction.setShortcut('Ctrl+N')
+        saveVAction.setShortcut('Ctrl+S')
+        saveMAction.setShortcut('Ctrl+Shift+S')
+        saveAAction.setShortcut('Ctrl+Shift+A')
+        infoAction.setShortcut('Ctrl+I')
+
+        # Adding Actions to menu-items
+        fileMenu.addAction(newAction)
+        saveMenu = fileMenu.addMenu('Save as...')
+        saveMenu.addAction(saveVAction)
+        saveMenu.addAction(saveMAction)
+        saveMenu.addAction(saveAAction)
+        fileMenu.addAction(infoAction)
+        aboutMenu.addAction(aboutAction)
+
+        # Setting functionality
+        newAction.triggered.connect(self.newCall)
+        saveVAction.triggered.connect(self.saveVCall)
+        saveMAction.triggered.connect(self.saveMCall)
+        saveAAction.triggered.connect(self.saveACall)
+        infoAction.triggered.connect(self.infoCall)
+        aboutAction.triggered.connect(self.aboutCall)
+
+    def newCall(self):
+        '''Called from the MenuBar to create a new Attractor()-Object.'''
+        self.newAttr = Attractor(process = self.processes,\
+                                 burnIn = self.burnIn)
+        self.newAttr.show()
+        self.attractors.append(self.newAttr)
+
+    def saveVCall(self):
+        '''Called from the MenuBar to export all created Attractors as vispy
+           export (.png).'''
+        self.pauseButton.toggle()
+        self.pauseAll()
+        file,_ = qt.QFileDialog.getSaveFileName(None, "Save Plots ...","","")
+        if file:
+            for ind,a in enumerate(self.attractors):
+                a.initPlot()
+                a.plot.export_vispy(file + '_vispy_' + str(ind) + '.png')
+            print('Successfully exported with Vispy to ' + file + '*')
+        else:
+            print('Invalid file-name. Could not save plots.')
+
+    def saveMCall(self):
+        '''Called from the MenuBar to export all created Attractors as
+           matplotlib export (.png).'''
+        self.pauseButton.toggle()
+        self.pauseAll()
+        file,_ = qt.QFileDialog.getSaveFileName(None, "Save Plots ...","","")
+        if file:
+            for ind,a in enumerate(self.attractors):
+                a.initPlot()
+                a.plot.export_plt(file + '_plt_' + str(ind) + '.png')
+            print('Successfully exported with Matplotlib to ' + file + '*')
+        else:
+            print('Invalid file-name. Could not save plots.')
+
+    def saveACall(self):
+        '''Called from the MenuBar to export all created Attractors as
+           animations (numbered .png-files). The frames are rendered by worker
+           processes while the GUI keeps running.'''
+        if self.animations:
+            print('An animation export is already running.')
+            return
+        self.pauseButton.toggle()
+        self.pauseAll()
+        directory = qt.QFileDialog.getExistingDirectory(None,"Save Animations ...")
+        if not directory:
+            print('Invalid directory. Could not save animations.')
+            return
+
+        # Asking for camera path, resolution and number of frames
+        path,ok = qt.QInputDialog.getItem(self,'Animation','Camera path:',\
+                                          list(self.cameraPaths),0,False)
+        if not ok:
+            return
+        size,ok = qt.QInputDialog.getItem(self,'Animation','Resolution:',\
+                                          ['1280x720','1920x1080','3840x2160'],\
+                                          1,False)
+        if not ok:
+            return
+        frames,ok = qt.QInputDialog.getInt(self,'Animation','Number of frames:',\
+                                           300,2,100000)
+        if not ok:
+            return
+
+        # All exports share one pool, so the worker processes start only once
+        size = tuple(int(v) for v in size.split('x'))
+        self.animPool = an.create_pool()
+        for ind,a in enumerate(self.attractors):
+            a.initPlot()
+            self.animations.append(an.AnimationExport(a.plot.get_data(),\
+                                   directory,frames=frames,size=size,\
+                                   prefix='animation_' + str(ind),\
+                                   pool=self.animPool,\
+                                   **self.cameraPaths[path]))
+        self.animDirectory = directory
+        self.animCount = len(self.animations)
+        self.animations[0].start()
+        self.animTimer.start(100)
+
+    def pollAnimations(self):
+        '''Called by animTimer. Polls the running animation export, shows the
+           progress and starts the next export once it is finished.'''
+        a = self.animations[0]
+        try:
+            finished = a.poll()
+        except Exception as e:
+            self.stopAnimations()
+            print('Could not save animations: ' + str(e))
+            return
+
+        print('Exporting animation %d of %d ... %d/%d frames' \
+              %(self.animCount - len(self.animations) + 1,self.animCount,\
+                finished,a.frames))
+        if a.done():
+            self.animations.pop(0)
+            if self.animations:
+                self.animations[0].start()
+            else:
+                self.stopAnimations()
+                print('Successfully exported animations to ' + \
+                      self.animDirectory)
+
+    def stopAnimations(self):
+        '''Stops all animation exports and their worker processes.'''
+        self.animTimer.stop()
+        for a in self.animations:
+            a.stop()
+        self.animations = []
+        if self.animPool is not None:
+            self.animPool.shutdown(wait=False,cancel_futures=True)
+            self.animPool = None
+
+    def infoCall(self):
+        '''Called from the MenuBar to open InfoWindow.'''
+        self.infoWin = wc.miniWindow('info')
+
+    def aboutCall(self):
+        '''Called from the MenuBar to open AboutWindow.'''
+        self.aboutWin = wc.miniWindow('about')
@@ -0,0 +1,213 @@
+from Solvers import attractorDic
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing as mp
+import numpy as np
+
+# Relative global error above which a trajectory counts as diverged
+divergenceTol = 1e-1
+
+# Stop flags of the pool's worker processes, set up by init_worker()
+stopFlags = None
+
+def init_worker(flags):
+    '''Initializer of the pool's worker processes, keeps the shared array of
+       stop flags.'''
+    global stopFlags
+    stopFlags = flags
+
+def DOPRI54(y,f,h,f1):
+    '''Dormand Prince Method, fifth order runge kutta method with embedded
+       forth order error estimation. Takes the derivative 'f1' = f(y) and
+       returns the new value, the error vector and the derivative at the new
+       value (to be used as 'f1' of the next step).'''
+    f2 = f(y + h*(1/5*f1))
+    f3 = f(y + h*(3/40*f1 + 9/40*f2))
+    f4 = f(y + h*(44/45*f1 - 56/15*f2 + 32/9*f3))
+    f5 = f(y + h*(19372/6561*f1 - 25360/2187*f2 + 64448/6561*f3 \
+                  - 212/729*f4))
+    f6 = f(y + h*(9017/3168*f1 - 355/33*f2 + 46732/5247*f3 + 49/176*f4 \
+                  - 5103/18656*f5))
+    yn = y + h*(35/384*f1 + 500/1113*f3 + 125/192*f4 - 2187/6784*f5 \
+                + 11/84*f6)
+    f7 = f(yn)
+    err = h*(71/57600*f1 - 71/16695*f3 + 71/1920*f4 - 17253/339200*f5 \
+             + 22/525*f6 - 1/40*f7)
+    return yn,err,f7
+
+def reference(type,params,initVals,end,dt,tol,slot=None):
+    '''Solves the ODE of the attractor 'type' with 'params' from 'initVals'
+       until 'end' with adaptive stepsize, so the estimated local error stays
+       below 'tol'. Returns the states at the times k*dt as an array, or None
+       if the stop flag 'slot' was set in the meantime.'''
+    f = attractorDic[type]['ODE'](params)
+    n = int(round(end/dt))
+    states = np.empty((n + 1,3))
+    y = np.array(initVals,dtype=float)
+    states[0] = y
+
+    t = 0
+    h = dt
+    f1 = f(y)
+    for k in range(1,n + 1):
+        if slot is not None and stopFlags[slot]:
+            return None
+        # Steps are shortened so they end exactly on the next output time
+        while t < k*dt:
+            last = t + h >= k*dt
+            hs = k*dt - t if last else h
+            yn,err,f7 = DOPRI54(y,f,hs,f1)
+            scale = tol*(1 + np.maximum(np.abs(y),np.abs(yn)))
+            errNorm = np.sqrt(np.mean((err/scale)**2))
+
+            if errNorm <= 1:
+                t = k*dt if last else t + hs
+                y,f1 = yn,f7
+            # New stepsize, a shortened step does not shrink it
+            factor = 5 if errNorm == 0 else min(5,max(0.2,0.9*errNorm**-0.2))
+            h = max(h,hs*factor) if last and errNorm <= 1 else hs*factor
+        states[k] = y
+    return states
+
+def checkedReference(type,params,initVals,end,dt,tol,agreement,slot=None):
+    '''Solves like reference(), once with 'tol' and once with tol/100. The
+       reference's own error grows over time, so the result (the one with
+       tol/100) is cut off at the first state where the two differ by more
+       than 'agreement' relative to the state. Returns the states up to
+       there, or None if the stop flag 'slot' was set in the meantime.'''
+    states = reference(type,params,initVals,end,dt,tol/100,slot)
+    check = None if states is None else \
+            reference(type,params,initVals,end,dt,tol,slot)
+    if check is None:
+        return None
+    differ = np.linalg.norm(states - check,axis=1) > \
+             agreement*np.linalg.norm(states,axis=1)
+    invalid = np.flatnonzero(differ)
+    return states[:invalid[0]] if len(invalid) else states
+
+def interpolate(states,f,dt,tau):
+    '''Returns the state at time 'tau' from the reference 'states' (at times
+       k*dt) via cubic hermite interpolation using the ODE 'f'. Returns None if
+       'tau' lies beyond the last state.'''
+    ind = int(tau//dt)
+    if tau < 0 or ind + 1 >= len(states):
+        return None
+    s = tau/dt - ind
+    y0,y1 = states[ind],states[ind + 1]
+    return (2*s**3 - 3*s**2 + 1)*y0 + (s**3 - 2*s**2 + s)*dt*f(y0) \
+           + (-2*s**3 + 3*s**2)*y1 + (s**3 - s**2)*dt*f(y1)
+
+class ReferenceEngine():
+    '''REFERENCEENGINE(processes=2,maxCached=32) computes high accuracy
+       reference trajectories on a pool of 'processes' worker processes and
+       caches up to 'maxCached' of them, keyed by attractor, parameters and
+       initial values. The least recently used reference is dropped first.
+       Every reference covers up to 'horizon' time units with states every
+       'step' time units, but ends where it stops being accurate to
+       'agreement' (see checkedReference()). The pool is kept small, so
+       references do not compete with the Workers solving the attractors.
+       Callers announce the keys they wait for with request() and release(),
+       a computation is only stopped once nobody waits for it anymore.'''
+    horizon = 50
+    step = 1e-3
+    tol = 1e-10
+    agreement = 1e-2*divergenceTol
+    # Number of computations that can be stopped while running
+    nSlots = 64
+
+    def __init__(self,processes=2,maxCached=32):
+        self.processes = processes
+        self.maxCached = maxCached
+        self.pool = None
+        self.flags = None
+        self.freeSlots = []
+        self.cache = {}
+        self.pending = {}
+        self.waiting = {}
+
+    def key(self,type,params,initVals):
+        '''Returns the cache key for the given inputs.'''
+        return (type,tuple(float(p) for p in params),\
+                tuple(float(v) for v in initVals))
+
+    def request(self,key):
+        '''Announces that a caller waits for the reference 'key'.'''
+        self.waiting[key] = self.waiting.get(key,0) + 1
+
+    def release(self,key):
+        '''Announces that a caller does not wait for the reference 'key'
+           anymore. Once nobody waits for it, its computation is cancelled or,
+           if it is running already, stopped.'''
+        if key not in self.waiting:
+            return
+        self.waiting[key] -= 1
+        if self.waiting[key] > 0:
+            return
+        del self.waiting[key]
+        future = self.pending.pop(key,None)
+        if future is not None and not future.cancel() and \
+           not future.done() and future.slot is not None:
+            future.flags[future.slot] = 1
+
+    def freeSlot(self,future):
+        '''Called when 'future' is done. Clears its stop flag and makes the
+           slot available again.'''
+        # Slots of a pool that was shut down are not reused
+        if future.slot is not None and future.flags is self.flags:
+            self.flags[future.slot] = 0
+            self.freeSlots.append(future.slot)
+
+    def get(self,key):
+        '''Returns the reference states for 'key' if they are available.
+           Otherwise their computation is started in the background (unless it
+           is running already) and None is returned.'''
+        if key in self.cache:
+            # Re-inserting moves the key to the end, so it is dropped last
+            self.cache[key] = self.cache.pop(key)
+            return self.cache[key]
+
+        future = self.pending.get(key)
+        if future is None:
+            # The pool is only started when the first reference is needed
+            if self.pool is None:
+                context = mp.get_context('spawn')
+                self.flags = context.Array('b',self.nSlots,lock=False)
+                self.freeSlots = list(range(self.nSlots))
+                self.pool = ProcessPoolExecutor(self.processes,\
+                                                mp_context=context,\
+                                                initializer=init_worker,\
+                                                initargs=(self.flags,))
+            # Without a free slot the computation cannot be stopped early
+            slot = self.freeSlots.pop() if self.freeSlots else None
+            if slot is not None:
+                self.flags[slot] = 0
+            future = self.pool.submit(checkedReference,*key,self.horizon,\
+                                      self.step,self.tol,self.agreement,slot)
+            future.slot = slot
+            future.flags = self.flags
+            future.add_done_callback(self.freeSlot)
+            self.pending[key] = future
+            return None
+        if not future.done():
+            return None
+
+        # Moving the result to the cache, the least recently used entry is
+        # dropped if the cache is full
+        del self.pending[key]
+        self.cache[key] = future.result()
+        if len(self.cache) > self.maxCached:
+            del self.cache[next(iter(self.cache))]
+        return self.cache[key]
+
+    def shutdown(self):
+        '''Stops the worker processes, pending computations are dropped.'''
+        if self.pool is not None:
+            # Running computations are stopped as well
+            self.flags[:] = [1]*self.nSlots
+            self.pool.shutdown(wait=False,cancel_futures=True)
+            self.pool = None
+            self.flags = None
+        self.pending = {}
+        self.waiting = {}
+
+# Engine shared by all Attractors, so references are reused between them
+engine = ReferenceEngine()
@@ -0,0 +1,146 @@
+import numpy as np
+import time
+
+def RKF45(y,f,h):
+    '''Runge Kutta Fehlberg Method, forth order runge kutta method with fifth
+       order error estimation'''
+    start = time.time()
+    y1 = y
+    f1 = f(y1)
+    y2 = y + h/4*f1
+    f2 = f(y2)
+    y3 = y + 3/32*h*f1 + 9/32*h*f2
+    f3 = f(y3)
+    y4 = y + 1932/2197*h*f1 - 7200/2197*h*f2 + 7296/2197*h*f3
+    f4 = f(y4)
+    y5 = y + 439/216*h*f1 - 8*h*f2 + 3680/513*h*f3 - 845/4104*h*f4
+    f5 = f(y5)
+    y6 = y - 8/27*h*f1 + 2*h*f2 - 3544/2565*h*f3 + 1859/4104*h*f4 \
+           - 11/40*h*f5
+    f6 = f(y6)
+    yn1 = y + 16/135*h*f1 + 6656/12825*h*f3 + 28561/56430*h*f4 \
+            - 9/50*h*f5 + 2/55*h*f6
+    yn2 = y + 25/216*h*f1 + 1408/2565*h*f3 + 2197/4104*h*f4 \
+            - 1/5*h*f5
+
+    err = np.linalg.norm(yn1 - yn2)/np.linalg.norm(yn2)
+    calc_time = time.time() - start
+    return yn2,calc_time,err
+
+def eRK4(y,f,h):
+    '''Standard Runge Kutta Method, forth order runge kutta method with error
+       estimation via additional calculation with halfed stepsize'''
+    def calc(y,f,h):
+        y1 = y
+        f1 = f(y1)
+        y2 = y + h/2*f1
+        f2 = f(y2)
+        y3 = y + h/2*f2
+        f3 = f(y3)
+        y4 = y + h*f3
+        return y + h/6*(f1 + 2*f2 + 2*f3 + f(y4))
+
+    start = time.time()
+    yn = calc(y,f,h)
+    yn_half = calc(calc(y,f,h/2),f,h/2)
+
+    err = np.linalg.norm(yn_half - yn)/np.linalg.norm(yn)
+    calc_time = time.time() - start
+    return yn,calc_time,err
+
+def expEul(y,f,h):
+    '''Explicit Euler Method, first order runge kutta method with error
+       estimation via additional calculation with halfed stepsize'''
+    calc = lambda y,f,h : y + h*f(y)
+
+    start = time.time()
+    yn = calc(y,f,h)
+    yn_half = calc(calc(y,f,h/2),f,h/2)
+
+    err = np.linalg.norm(yn_half - yn)/np.linalg.norm(yn)
+    calc_time = time.time() - start
+    return yn,calc_time,err
+
+def lorenzODE(param):
+    def func(y):
+        f = np.array([param[0]*(y[1]-y[0]),\
+            y[0]*(param[1]-y[2])-y[1],\
+            y[0]*y[1] - param[2]*y[2]])
+        return f
+    return func
+
+def thomasODE(param):
+    def func(y):
+        f = np.array([np.sin(y[1]) - param[0]*y[0],\
+            np.sin(y[2]) - param[0]*y[1],\
+            np.sin(y[0]) - param[0]*y[2]])
+        return f
+    return func
+
+def roesslerODE(param):
+    def func(y):
+        f = np.array([-y[1]-y[2],\
+            y[0] + param[0]*y[1],\
+            param[1] + y[2]*(y[0] - param[2])])
+        return f
+    return func
+
+solverDic = {'Explicit Euler' : expEul,
+             'Runge Kutta 4' : eRK4,
+             'Fehlberg 4,5' : RKF45}
+attractorDic = {'Lorenz' : {'ODE' : lorenzODE,
+                            'Parameters' : [('a','b','c'),(10,28,8/3)],
+                            'Interval' : [(1,100),(1,50),(0.1,10)],
+                            'InVal' : [1,1,1]},
+                'Thomas' : {'ODE' : thomasODE,
+                            'Parameters' : [('b'),(0.208186,)],
+                            'Interval' : [(0.0001,1)],
+                            'InVal' : [0,-1,7]},
+                'Roessler' :{'ODE' : roesslerODE,
+                            'Parameters' : [('a','b','c'),(0.2,0.2,14)],
+                            'Interval' : [(0,2),(0,2),(1,20)],
+                            'InVal' : [1,1,0]}}
+
+# On-attractor states found by burnIn(), keyed by burnInKey()
+burnInCache = {}
+
+def burnInKey(type,params):
+    '''Returns the key of burnInCache for the attractor 'type' and 'params'.'''
+    return (type,tuple(float(p) for p in params))
+
+def burnInBatch(type,paramSets,end=50,h=2e-2):
+    '''Solves the ODE of the attractor 'type' for every parameter set in
+       'paramSets' from its standard initial values until 'end' without
+       storing any intermediate values, so the transient is skipped. All sets
+       are solved in one vectorized run: every parameter is an array over the
+       sets and the state is a 3 x len(paramSets) array. The classic runge
+       kutta method is used without timing or error estimation. Returns the
+       on-attractor states (None where the solution does not stay finite) and
+       caches them per attractor and parameters.'''
+    params = [np.array(p,dtype=float) for p in zip(*paramSets)]
+    f = attractorDic[type]['ODE'](params)
+    y = np.tile(np.array(attractorDic[type]['InVal'],dtype=float)[:,None],\
+                (1,len(paramSets)))
+    with np.errstate(over='ignore',invalid='ignore'):
+        for k in range(int(round(end/h))):
+            f1 = f(y)
+            f2 = f(y + h/2*f1)
+            f3 = f(y + h/2*f2)
+            f4 = f(y + h*f3)
+            y = y + h/6*(f1 + 2*f2 + 2*f3 + f4)
+
+    states = []
+    for ind,p in enumerate(paramSets):
+        state = y[:,ind] if np.all(np.isfinite(y[:,ind])) else None
+        burnInCache[burnInKey(type,p)] = state
+        states.append(state)
+    return states
+
+def burnIn(type,params,end=50,h=2e-2):
+    '''Returns the (cached) on-attractor state of the attractor 'type' with
+       'params', see burnInBatch(). Returns None if the solution does not
+       stay finite.'''
+    key = burnInKey(type,params)
+    if key not in burnInCache:
+        burnInBatch(type,[params],end,h)
+    return burnInCache[key]
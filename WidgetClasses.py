@@ -1,10 +1,22 @@
 from PyQt5.QtCore import Qt, QObject, pyqtSignal
 from vispy import scene, io, color
-from mpl_toolkits import mplot3d
 import PyQt5.QtWidgets as qt
-import matplotlib.pyplot as plt
 import numpy as np
 import sys
+import os
+
+# Contents of the html-files shown by miniWindow, read on first use
+htmlCache = {}
+
+def read_html(which):
+    '''Returns the contents of the html-file 'which' + '.html', which is looked
+       up next to this module. Files are only read once.'''
+    if which not in htmlCache:
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)),\
+                            which + '.html')
+        with open(path) as f:
+            htmlCache[which] = f.read()
+    return htmlCache[which]
 
 class Signal(QObject):
     '''Signal creates a pyqtSignal to be emitted in other classes.'''
@@ -32,7 +44,7 @@ class Status():
 
 class plot(scene.SceneCanvas):
     '''PLOT features a vispyCanvas for plotting which includes a line object as
-       well as three textboxes. It delivers methods for updating the line's data
+       well as four textboxes. It delivers methods for updating the line's data
        and the text boxes' values. PLOT can be embedded into pyqt applications
        when plot.native is used. The constructor takes an optional input
        'initData' which sets the curve's initial data.'''
@@ -59,6 +71,8 @@ class plot(scene.SceneCanvas):
                                             text = 'Calculation Time (avg):')
         self.InfoError = scene.visuals.Text(parent=self.scene, anchor_x='left',\
                                             text = 'Estimated local Error (avg):')
+        self.InfoGlobal = scene.visuals.Text(parent=self.scene, anchor_x='left',\
+                                             text = 'Global Error:')
 
         self.Curve = scene.visuals.Line(np.array(self.CurveData),\
                                         parent=view.scene,\
@@ -80,6 +94,10 @@ class plot(scene.SceneCanvas):
         self.InfoError.font_size = 7
         self.InfoError.color = 'white'
 
+        self.InfoGlobal.pos = 10, 75
+        self.InfoGlobal.font_size = 7
+        self.InfoGlobal.color = 'white'
+
     def add_data(self,data):
         '''Adds data to the curve to be plotted.'''
         self.CurveData = np.append(self.CurveData,data,0)
@@ -107,6 +125,18 @@ class plot(scene.SceneCanvas):
         '''Updates the plots 'Estimated local Error:'-textBox.'''
         self.InfoError.text = 'Estimated local Error (avg): %.2e %%' %(err*100)
 
+    def update_global_error(self,err,tDiv=None,status=None):
+        '''Updates the plots 'Global Error:'-textBox. If 'tDiv' is given, the
+           time of divergence is added. If 'status' is given, it is shown
+           instead of the error.'''
+        if status is not None:
+            self.InfoGlobal.text = 'Global Error: ' + status
+            return
+        text = 'Global Error: %.2e %%' %(err*100)
+        if tDiv is not None:
+            text += ' (diverged after %.2f s)' %tDiv
+        self.InfoGlobal.text = text
+
     def export_vispy(self,name):
         '''Exports the current plot via Vispy's render()-method as .png. The
            snapshot includes the curve as well as the textboxes.'''
@@ -116,6 +146,11 @@ class plot(scene.SceneCanvas):
     def export_plt(self,name):
         '''Exports the current plot via Matplotlib's savefig()-method as .png.
            The snapshot only includes the curve's data (and axes).'''
+        # Matplotlib is only imported when needed, since importing it slows
+        # down the start of the application considerably
+        from mpl_toolkits import mplot3d
+        import matplotlib.pyplot as plt
+
         data = self.CurveData
         ax = plt.axes(projection='3d')
         ax.plot3D(data[:,0], data[:,1], data[:,2])
@@ -304,13 +339,11 @@ class miniWindow(qt.QMainWindow):
         if which == 'about':
             self.setWindowTitle('About')
             self.resize(300,150)
-            with open('about.html') as f:
-                text = f.read()
+            text = read_html('about')
         elif which == 'info':
             self.setWindowTitle('Informations')
             self.resize(600,300)
-            with open('info.html') as f:
-                text = f.read()
+            text = read_html('info')
         else:
             text = ''
 
@@ -0,0 +1,358 @@
+from Solvers import solverDic, attractorDic, burnInBatch, burnInKey, \
+                    burnInCache
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+import multiprocessing as mp
+import numpy as np
+import queue
+import time
+
+class TrajectoryBuffer():
+    '''TRAJECTORYBUFFER(capacity=2**16,name=None) wraps a block of
+       multiprocessing.shared_memory holding a ring buffer of 'capacity' rows
+       (t,x,y,z,calcTime,locErr) behind a header (count,generation,tag) and an
+       anchor (t,x,y,z), which is the state at which the change with the
+       number 'tag' took effect. If 'name' is None a new block is created,
+       otherwise the existing block 'name' is attached. Rows are exposed as
+       numpy views into the shared block, so no data is copied between
+       processes.'''
+    nCols = 6
+
+    def __init__(self,capacity=2**16,name=None):
+        create = name is None
+        size = 8*(3 + 4 + capacity*self.nCols)
+        self.shm = shared_memory.SharedMemory(name=name,create=create,size=size)
+        self.name = self.shm.name
+        self.capacity = capacity
+
+        self.header = np.ndarray((3,),dtype=np.int64,buffer=self.shm.buf)
+        self.anchor = np.ndarray((4,),dtype=np.float64,buffer=self.shm.buf,\
+                                 offset=24)
+        self.rows = np.ndarray((capacity,self.nCols),dtype=np.float64,\
+                               buffer=self.shm.buf,offset=56)
+        if create:
+            self.header[:] = 0
+            self.anchor[:] = 0
+
+    def count(self):
+        '''Returns the number of rows written since the last reset.'''
+        return int(self.header[0])
+
+    def generation(self):
+        '''Returns the number of resets done so far.'''
+        return int(self.header[1])
+
+    def write(self,rows):
+        '''Writes 'rows' to the ring buffer. The counter is only increased
+           after the data is in place, so readers never see unfinished rows.'''
+        n = self.header[0]
+        for k,row in enumerate(rows):
+            self.rows[(n + k) % self.capacity] = row
+        self.header[0] = n + len(rows)
+
+    def reset(self):
+        '''Empties the buffer and starts a new generation. The counter is
+           cleared before the generation is increased, so a reader can always
+           tell whether the rows it read belong to the current generation.'''
+        self.header[0] = 0
+        self.header[1] += 1
+
+    def set_anchor(self,tag,t,y):
+        '''Stores the state (t,y) at which the change 'tag' took effect. The
+           tag is cleared while the anchor is written, so readers never see a
+           tag together with an unfinished anchor.'''
+        self.header[2] = 0
+        self.anchor[:] = (t,y[0],y[1],y[2])
+        self.header[2] = tag
+
+    def get_anchor(self,tag):
+        '''Returns the anchor (t,x,y,z) of the change 'tag', or None if the
+           writer did not apply it yet.'''
+        if self.header[2] != tag:
+            return None
+        anchor = np.array(self.anchor)
+        # Discard the anchor if it was overwritten while it was copied
+        if self.header[2] != tag:
+            return None
+        return anchor
+
+    def read(self,start,stop):
+        '''Returns the rows with counter values in [start,stop). The result is
+           a view into the shared block unless the range wraps around the end
+           of the ring, in which case the two parts are concatenated.'''
+        a = start % self.capacity
+        b = a + stop - start
+        if b <= self.capacity:
+            return self.rows[a:b]
+        return np.concatenate((self.rows[a:],self.rows[:b - self.capacity]))
+
+    def close(self):
+        '''Detaches from the shared block.'''
+        # Views have to be released before the block can be closed
+        del self.header, self.anchor, self.rows
+        self.shm.close()
+
+    def unlink(self):
+        '''Frees the shared block. Must be called by the creating process.'''
+        self.shm.unlink()
+
+def integrate(name,capacity,control,type,solver,params,timestep,initVals,\
+              minInterval=1e-3,maxBatch=256,maxWait=0.1):
+    '''Worker loop run in a separate process. Attaches to the TRAJECTORYBUFFER
+       'name', solves the ODE of 'type' and writes every step into the buffer.
+       The simulated time runs in real time like the timer of Attractor does,
+       but never faster than one step per 'minInterval' seconds. Control
+       messages are read from the queue 'control', the worker waits for them
+       until the next step is due, but at most 'maxWait' seconds at once.'''
+    buf = TrajectoryBuffer(capacity,name)
+    ode = attractorDic[type]['ODE'](params)
+    solve = solverDic[solver]
+    y = np.array(initVals,dtype=float)
+    t = 0
+    paused = False
+    running = True
+
+    # Wall clock time the step counter refers to and steps done since then
+    origin = time.perf_counter()
+    done = 0
+
+    while running:
+        # Waiting for control messages until the next step is due, so they
+        # are handled right away, then handling all pending ones
+        interval = max(timestep,minInterval)
+        wait = maxWait if paused else \
+               min(maxWait,origin + (done + 1)*interval - time.perf_counter())
+        while True:
+            try:
+                msg = control.get(timeout=wait) if wait > 0 else \
+                      control.get_nowait()
+            except queue.Empty:
+                break
+            wait = 0
+
+            # Only changes of the timestep, pausing and restarting restart the
+            # pacing, otherwise frequent messages (e.g. while a slider is
+            # dragged) would keep the worker from making any progress
+            if msg[0] == 'parameters':
+                params = msg[1]
+                ode = attractorDic[type]['ODE'](params)
+                buf.set_anchor(msg[2],t,y)
+            elif msg[0] == 'attractor':
+                type, params = msg[1], msg[2]
+                ode = attractorDic[type]['ODE'](params)
+                buf.set_anchor(msg[3],t,y)
+            elif msg[0] == 'solver':
+                solve = solverDic[msg[1]]
+            elif msg[0] == 'timestep':
+                if msg[1] != timestep:
+                    timestep = msg[1]
+                    origin = time.perf_counter()
+                    done = 0
+            elif msg[0] == 'pause':
+                paused = msg[1]
+                origin = time.perf_counter()
+                done = 0
+            elif msg[0] == 'restart':
+                y = np.array(msg[1],dtype=float)
+                t = 0
+                buf.reset()
+                origin = time.perf_counter()
+                done = 0
+            elif msg[0] == 'stop':
+                running = False
+                break
+
+        if paused or not running:
+            continue
+
+        # Number of steps due until now according to the pacing
+        interval = max(timestep,minInterval)
+        due = int((time.perf_counter() - origin)/interval) - done
+        if due <= 0:
+            continue
+
+        rows = []
+        for k in range(min(due,maxBatch)):
+            y,calc_time,err = solve(y,ode,timestep)
+            t += timestep
+            rows.append((t,y[0],y[1],y[2],calc_time,err))
+        buf.write(rows)
+        done += len(rows)
+
+    buf.close()
+
+class Worker():
+    '''WORKER(type,solver,params,timestep,initVals,capacity=2**16) starts a
+       separate process solving an attractor's ODE and writing the results to
+       a TRAJECTORYBUFFER. It delivers methods to send control messages to the
+       process and to read the rows written since the last call of read().'''
+    # Start method 'spawn' avoids forking a running Qt application
+    context = mp.get_context('spawn')
+
+    def __init__(self,type,solver,params,timestep,initVals,capacity=2**16):
+        self.buffer = TrajectoryBuffer(capacity)
+        self.control = self.context.Queue()
+
+        # Rows of older generations are dropped, the counter keeps track of
+        # the rows already read
+        self.generation = 0
+        self.readCount = 0
+
+        # Number of the last change of parameters or attractor
+        self.tag = 0
+
+        self.process = self.context.Process(target=integrate,daemon=True,\
+                                            args=(self.buffer.name,capacity,\
+                                                  self.control,type,solver,\
+                                                  list(params),timestep,\
+                                                  list(initVals)))
+        self.process.start()
+
+    def set_parameters(self,params):
+        '''Sends new ODE parameters to the process. Returns the tag of the
+           change, see anchor().'''
+        self.tag += 1
+        self.control.put(('parameters',list(params),self.tag))
+        return self.tag
+
+    def set_attractor(self,type,params):
+        '''Sends a new attractor type and its parameters to the process.
+           Returns the tag of the change, see anchor().'''
+        self.tag += 1
+        self.control.put(('attractor',type,list(params),self.tag))
+        return self.tag
+
+    def anchor(self,tag):
+        '''Returns the time and state (t,x,y,z) at which the process applied
+           the change 'tag', or None if it did not apply it yet.'''
+        return self.buffer.get_anchor(tag)
+
+    def set_solver(self,solver):
+        '''Sends the name of a new solver to the process.'''
+        self.control.put(('solver',solver))
+
+    def set_timestep(self,timestep):
+        '''Sends a new timestep to the process.'''
+        self.control.put(('timestep',timestep))
+
+    def pause(self,paused):
+        '''Pauses the process if 'paused' is True, resumes it otherwise.'''
+        self.control.put(('pause',paused))
+
+    def restart(self,initVals):
+        '''Restarts the process' calculation from 'initVals'. Rows written
+           before the process received the message are not read anymore.'''
+        self.generation += 1
+        self.readCount = 0
+        self.control.put(('restart',list(initVals)))
+
+    def read(self):
+        '''Returns the rows (t,x,y,z,calcTime,locErr) written since the last
+           call as an array. If the process wrote more rows than the buffer
+           can hold in between, only the most recent ones are returned.'''
+        empty = np.empty((0,TrajectoryBuffer.nCols))
+        if self.buffer.generation() != self.generation:
+            return empty
+
+        stop = self.buffer.count()
+        start = max(self.readCount,stop - self.buffer.capacity//2)
+        if stop <= start:
+            return empty
+        rows = np.array(self.buffer.read(start,stop))
+
+        # Discard the rows if the process restarted while they were copied
+        if self.buffer.generation() != self.generation:
+            return empty
+        self.readCount = stop
+        return rows
+
+    def stop(self):
+        '''Stops the process and frees the shared memory.'''
+        self.control.put(('stop',))
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.buffer.close()
+        self.buffer.unlink()
+
+class BurnInEngine():
+    '''BURNINENGINE(processes=2) runs burn-ins (see Solvers.burnInBatch) on a
+       pool of 'processes' worker processes, so the GUI never waits for them.
+       Burn-ins requested before the next call of get() are solved together in
+       one vectorized batch per attractor. Results are stored in
+       Solvers.burnInCache. A failed batch is not cached, its keys count as
+       not finite until they are requested again.'''
+
+    def __init__(self,processes=2):
+        self.processes = processes
+        self.pool = None
+        self.queued = {}
+        self.pending = {}
+
+    def get(self,type,params):
+        '''Returns (True,state) if the burn-in for 'type' and 'params' is done,
+           the state being None if the solution did not stay finite. Otherwise
+           the burn-in is queued (or the queued ones are started) and
+           (False,None) is returned.'''
+        key = burnInKey(type,params)
+        if key in burnInCache:
+            return True,burnInCache[key]
+        if key not in self.pending and key not in self.queued:
+            self.queued[key] = list(params)
+            return False,None
+        self.submit()
+
+        future = self.pending.get(key)
+        if future is None or not future.done():
+            return False,None
+        for k in future.keys:
+            self.pending.pop(k,None)
+        try:
+            states = future.result()
+        except BrokenProcessPool:
+            # A new pool is started for the next batch
+            if self.pool is future.pool:
+                self.pool.shutdown(wait=False,cancel_futures=True)
+                self.pool = None
+            return True,None
+        except Exception:
+            return True,None
+        # All keys of the batch are cached at once
+        for k,state in zip(future.keys,states):
+            burnInCache[k] = state
+        return True,burnInCache[key]
+
+    def submit(self):
+        '''Starts the queued burn-ins, one batch per attractor.'''
+        if not self.queued:
+            return
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(self.processes,\
+                                            mp_context=Worker.context)
+        for type in {k[0] for k in self.queued}:
+            keys = [k for k in self.queued if k[0] == type]
+            try:
+                future = self.pool.submit(burnInBatch,type,\
+                                          [self.queued[k] for k in keys])
+            except BrokenProcessPool:
+                # The burn-ins stay queued and go to a new pool next time
+                self.pool.shutdown(wait=False,cancel_futures=True)
+                self.pool = None
+                return
+            future.keys = keys
+            future.pool = self.pool
+            for k in keys:
+                self.pending[k] = future
+                del self.queued[k]
+
+    def shutdown(self):
+        '''Stops the worker processes, pending burn-ins are dropped.'''
+        if self.pool is not None:
+            self.pool.shutdown(wait=False,cancel_futures=True)
+            self.pool = None
+        self.queued = {}
+        self.pending = {}
+
+# Engine shared by all Attractors, so burn-ins are batched and reused
+burnInEngine = BurnInEngine()
@@ -0,0 +1,192 @@
+from Solvers import solverDic, attractorDic, burnIn
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import argparse
+import json
+import math
+import time
+import sys
+import os
+
+# Number of steps solved before they are written to the output file
+chunkSize = 4096
+
+def is_number(value):
+    '''Returns True if 'value' is a finite int or float (but no bool).'''
+    return isinstance(value,(int,float)) and not isinstance(value,bool) and \
+           math.isfinite(value)
+
+def load_jobs(file):
+    '''Reads the job file 'file' (JSON), which holds either a list of jobs or
+       a dictionary with the key 'jobs'. Every job is a dictionary with the
+       keys 'attractor' and either 'steps' or 'end' and the optional keys
+       'name', 'parameters', 'solver', 'timestep', 'initVals', 'burnIn' and
+       'output'. Missing values are taken from attractorDic. If 'burnIn' is
+       true, the job starts from an on-attractor state instead of 'initVals'.
+       Returns the completed jobs, invalid jobs raise a ValueError.'''
+    with open(file) as f:
+        jobs = json.load(f)
+    if isinstance(jobs,dict):
+        jobs = jobs['jobs']
+    if not isinstance(jobs,list):
+        raise ValueError('The job file must hold a list of jobs.')
+
+    complete = []
+    outputs = set()
+    for ind,job in enumerate(jobs):
+        if not isinstance(job,dict):
+            raise ValueError('Job %d: must be a dictionary.' %ind)
+        if job.get('attractor') not in attractorDic:
+            raise ValueError('Job %d: unknown attractor %r.' \
+                             %(ind,job.get('attractor')))
+        attr = attractorDic[job['attractor']]
+
+        job = dict(job)
+        job.setdefault('name','%s_%d' %(job['attractor'],ind))
+        if not isinstance(job['name'],str):
+            raise ValueError('Job %d: name must be a string.' %ind)
+        job.setdefault('parameters',list(attr['Parameters'][1]))
+        job.setdefault('solver','Runge Kutta 4')
+        job.setdefault('timestep',1e-2)
+        job.setdefault('initVals',list(attr['InVal']))
+        job.setdefault('burnIn',False)
+        job.setdefault('output',job['name'] + '.npy')
+
+        if job['solver'] not in solverDic:
+            raise ValueError('Job %d: unknown solver %r.' %(ind,job['solver']))
+        if not is_number(job['timestep']) or job['timestep'] <= 0:
+            raise ValueError('Job %d: timestep must be a positive number.' %ind)
+        if not isinstance(job['parameters'],list) or \
+           len(job['parameters']) != len(attr['Parameters'][1]) or \
+           not all(is_number(p) for p in job['parameters']):
+            raise ValueError('Job %d: %s takes %d numeric parameters.' \
+                             %(ind,job['attractor'],len(attr['Parameters'][1])))
+        if not isinstance(job['initVals'],list) or len(job['initVals']) != 3 \
+           or not all(is_number(v) for v in job['initVals']):
+            raise ValueError('Job %d: initVals must be 3 numbers.' %ind)
+        if 'steps' not in job:
+            if 'end' not in job:
+                raise ValueError('Job %d: either steps or end is needed.' %ind)
+            if not is_number(job['end']) or job['end'] < 0:
+                raise ValueError('Job %d: end must be a non-negative number.' \
+                                 %ind)
+            if not math.isfinite(job['end']/job['timestep']):
+                raise ValueError('Job %d: end/timestep is too large.' %ind)
+            job['steps'] = math.ceil(job['end']/job['timestep'])
+        if isinstance(job['steps'],bool) or not isinstance(job['steps'],int) \
+           or job['steps'] < 0:
+            raise ValueError('Job %d: steps must be a non-negative integer.' %ind)
+        if not isinstance(job['output'],str) or \
+           os.path.splitext(job['output'])[1] not in ('.npy','.csv'):
+            raise ValueError('Job %d: output must be a .npy or .csv file.' %ind)
+        # Jobs run in parallel, so they must not write to the same file
+        output = os.path.normpath(job['output'])
+        if output in outputs:
+            raise ValueError('Job %d: output %r is written by another job.' \
+                             %(ind,job['output']))
+        outputs.add(output)
+        complete.append(job)
+    return complete
+
+def run_job(job):
+    '''Solves the ODE specified in 'job' and streams the rows (t,x,y,z,locErr)
+       in chunks to the job's output file. Returns the job's name, the number
+       of steps and the runtime.'''
+    start = time.perf_counter()
+    ode = attractorDic[job['attractor']]['ODE'](job['parameters'])
+    solve = solverDic[job['solver']]
+    h = job['timestep']
+    n = job['steps']
+
+    # .npy files are written through a memory map so the whole trajectory
+    # never has to be held in memory, .csv files are appended to
+    if job['output'].endswith('.npy'):
+        out = np.lib.format.open_memmap(job['output'],mode='w+',\
+                                        dtype=np.float64,shape=(n + 1,5))
+        def write(pos,rows):
+            out[pos:pos + len(rows)] = rows
+    else:
+        out = open(job['output'],'w')
+        out.write('t,x,y,z,locErr\n')
+        def write(pos,rows):
+            np.savetxt(out,rows,delimiter=',')
+
+    y = np.array(job['initVals'],dtype=float)
+    if job['burnIn']:
+        state = burnIn(job['attractor'],job['parameters'])
+        if state is None:
+            raise ValueError('solution does not stay finite during burn-in')
+        y = state
+    chunk = [(0,y[0],y[1],y[2],0)]
+    pos = 0
+    for k in range(1,n + 1):
+        y,_,err = solve(y,ode,h)
+        chunk.append((k*h,y[0],y[1],y[2],err))
+        if len(chunk) == chunkSize:
+            write(pos,np.array(chunk))
+            pos += len(chunk)
+            chunk = []
+    if chunk:
+        write(pos,np.array(chunk))
+
+    if isinstance(out,np.memmap):
+        out.flush()
+    else:
+        out.close()
+    return job['name'],n,time.perf_counter() - start
+
+def run_batch(jobs,processes=None,stream=sys.stdout):
+    '''Runs 'jobs' in parallel on a pool of 'processes' worker processes (all
+       cores if None) and prints a line to 'stream' for each finished job as
+       well as a summary. Returns the number of failed jobs.'''
+    start = time.perf_counter()
+    steps = 0
+    failed = 0
+
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = {pool.submit(run_job,job) : job for job in jobs}
+        for ind,future in enumerate(as_completed(futures),1):
+            job = futures[future]
+            try:
+                name,n,runtime = future.result()
+            except Exception as e:
+                failed += 1
+                print('[%d/%d] %s failed: %s' %(ind,len(jobs),job['name'],e),\
+                      file=stream)
+            else:
+                steps += n
+                print('[%d/%d] %s: %d steps in %.2f s (%.0f steps/s) -> %s' \
+                      %(ind,len(jobs),name,n,runtime,n/runtime,job['output']),\
+                      file=stream)
+            stream.flush()
+
+    total = time.perf_counter() - start
+    print('Finished %d of %d jobs: %d steps in %.2f s (%.0f steps/s)' \
+          %(len(jobs) - failed,len(jobs),steps,total,steps/total),file=stream)
+    return failed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Solve attractors without '+\
+                                     'a GUI. The jobs are read from a JSON '+\
+                                     'job file, see load_jobs().')
+    parser.add_argument('jobfile',help='JSON file containing the jobs')
+    parser.add_argument('-j','--processes',type=int,default=None,\
+                        help='number of worker processes (default: all cores)')
+    parser.add_argument('-o','--outdir',default=None,\
+                        help='directory for relative output paths')
+    args = parser.parse_args(argv)
+
+    try:
+        jobs = load_jobs(args.jobfile)
+    except (OSError,ValueError,KeyError) as e:
+        parser.error(str(e))
+
+    if args.outdir is not None:
+        os.makedirs(args.outdir,exist_ok=True)
+        for job in jobs:
+            job['output'] = os.path.join(args.outdir,job['output'])
+
+    return 1 if run_batch(jobs,args.processes) else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
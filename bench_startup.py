@@ -0,0 +1,70 @@
+import subprocess
+import argparse
+import json
+import time
+import sys
+import os
+
+def measure(n):
+    '''Measures the startup of an AttractorApp with 'n' Attractors in the
+       running interpreter. Returns the time needed for importing the GUI,
+       until the window is shown and until all canvases are created.'''
+    # AttractorApp redirects stdout to its status bar
+    stdout = sys.stdout
+
+    start = time.perf_counter()
+    import PyQt5.QtWidgets as qt
+    import AppClasses
+    imported = time.perf_counter()
+
+    application = qt.QApplication(sys.argv[:1])
+    a = AppClasses.AttractorApp(n = n,types = ['Lorenz'])
+    shown = time.perf_counter()
+
+    # Processing events until every Attractor created its canvas
+    while any(attr.plot is None for attr in a.attractors):
+        application.processEvents()
+    ready = time.perf_counter()
+
+    a.close()
+    sys.stdout = stdout
+    return {'import' : imported - start,\
+            'shown' : shown - start,\
+            'ready' : ready - start}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure the startup time '+\
+                                     'of the AttractorApp. Every repetition '+\
+                                     'runs in a fresh interpreter.')
+    parser.add_argument('-n',type=int,default=2,help='number of Attractors')
+    parser.add_argument('-r','--repeat',type=int,default=5,\
+                        help='number of repetitions')
+    parser.add_argument('--once',action='store_true',help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.once:
+        print(json.dumps(measure(args.n)))
+        return 0
+
+    # Running without a display unless a platform is set explicitly
+    env = dict(os.environ)
+    env.setdefault('QT_QPA_PLATFORM','offscreen')
+    here = os.path.dirname(os.path.abspath(__file__))
+
+    results = []
+    for k in range(args.repeat):
+        out = subprocess.run([sys.executable,os.path.abspath(__file__),\
+                              '--once','-n',str(args.n)],cwd=here,env=env,\
+                             stdout=subprocess.PIPE,check=True,\
+                             universal_newlines=True).stdout
+        results.append(json.loads(out.strip().splitlines()[-1]))
+
+    print('Startup of AttractorApp with %d Attractors (%d runs, best/mean):' \
+          %(args.n,args.repeat))
+    for key in ('import','shown','ready'):
+        vals = [r[key] for r in results]
+        print('  %-7s %7.3f s  %7.3f s' %(key,min(vals),sum(vals)/len(vals)))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())